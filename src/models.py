@@ -1,9 +1,10 @@
-"""Pydantic data models for EC2 Capacity Blocks pricing."""
+"""Data models for EC2 Capacity Blocks pricing."""
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class PricingEntry(BaseModel):
+@dataclass(slots=True)
+class PricingEntry:
     """Pricing information for a specific region."""
 
     region: str
@@ -12,7 +13,8 @@ class PricingEntry(BaseModel):
     accelerator_hourly_rate_usd: float
 
 
-class InstanceTypePricing(BaseModel):
+@dataclass(slots=True)
+class InstanceTypePricing:
     """Pricing information for a specific instance type."""
 
     instance_family: str
@@ -21,7 +23,8 @@ class InstanceTypePricing(BaseModel):
     pricing: list[PricingEntry]
 
 
-class PricingMetadata(BaseModel):
+@dataclass(slots=True)
+class PricingMetadata:
     """Metadata about the pricing data."""
 
     last_updated: str
@@ -29,7 +32,8 @@ class PricingMetadata(BaseModel):
     version: str
 
 
-class PricingData(BaseModel):
+@dataclass(slots=True)
+class PricingData:
     """Complete pricing data structure."""
 
     metadata: PricingMetadata
@@ -1,13 +1,26 @@
 """Parser for EC2 Capacity Blocks pricing page HTML."""
 
-import json
+import functools
 import re
+from collections import defaultdict
 from html import unescape
 
-from bs4 import BeautifulSoup
+import orjson
 
 from .models import InstanceTypePricing, PricingEntry
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_SCRIPT_OPEN = b'<script type="application/json">'
+_SCRIPT_CLOSE = b"</script>"
+# Matches "$31.464 USD ($3.933 USD)", "$761.904 ($10.582 USD)" and "$11.8 USD"
+# in one scan; the per-accelerator group is None for single prices. Tags may
+# appear anywhere between tokens (e.g. "<strong>$31.464</strong> USD<br />(...)").
+_PRICE_GAP = r"(?:\s|<[^>]*>)*"
+_PRICE_RE = re.compile(
+    rf"\$?([\d,]+\.?\d*){_PRICE_GAP}"
+    rf"(?:(?:USD{_PRICE_GAP})?\({_PRICE_GAP}\$?([\d,]+\.?\d*){_PRICE_GAP}USD{_PRICE_GAP}\)|USD)"
+)
+
 REGION_NAME_TO_CODE = {
     "US East (N. Virginia)": "us-east-1",
     "US East (Ohio)": "us-east-2",
@@ -53,32 +66,52 @@ REGION_NAME_TO_CODE = {
     "US West (Phoenix) Local Zone": "us-west-2-phx-2a",
 }
 
-INSTANCE_TYPE_INFO: dict[str, dict] = {
+# Case- and whitespace-insensitive view of REGION_NAME_TO_CODE for lookups.
+_REGION_CODE_BY_KEY = {name.casefold().strip(): code for name, code in REGION_NAME_TO_CODE.items()}
+
+# instance type -> (family, accelerator, accelerator count)
+INSTANCE_TYPE_INFO: dict[str, tuple[str, str, int]] = {
     # P6e (UltraServer) - GB200
-    "u-p6e-gb200x72": {"family": "P6e", "accelerator": "GB200", "count": 72},
-    "u-p6e-gb200x36": {"family": "P6e", "accelerator": "GB200", "count": 36},
+    "u-p6e-gb200x72": ("P6e", "GB200", 72),
+    "u-p6e-gb200x36": ("P6e", "GB200", 36),
     # P6-B300
-    "p6-b300.48xlarge": {"family": "P6-B300", "accelerator": "B300", "count": 8},
+    "p6-b300.48xlarge": ("P6-B300", "B300", 8),
     # P6-B200
-    "p6-b200.48xlarge": {"family": "P6-B200", "accelerator": "B200", "count": 8},
+    "p6-b200.48xlarge": ("P6-B200", "B200", 8),
     # P5
-    "p5.48xlarge": {"family": "P5", "accelerator": "H100", "count": 8},
-    "p5.4xlarge": {"family": "P5", "accelerator": "H100", "count": 1},
+    "p5.48xlarge": ("P5", "H100", 8),
+    "p5.4xlarge": ("P5", "H100", 1),
     # P5e
-    "p5e.48xlarge": {"family": "P5e", "accelerator": "H200", "count": 8},
+    "p5e.48xlarge": ("P5e", "H200", 8),
     # P5en
-    "p5en.48xlarge": {"family": "P5en", "accelerator": "H200", "count": 8},
+    "p5en.48xlarge": ("P5en", "H200", 8),
     # P4d
-    "p4d.24xlarge": {"family": "P4d", "accelerator": "A100", "count": 8},
-    "p4de.24xlarge": {"family": "P4de", "accelerator": "A100", "count": 8},
+    "p4d.24xlarge": ("P4d", "A100", 8),
+    "p4de.24xlarge": ("P4de", "A100", 8),
     # Trainium
-    "trn1.32xlarge": {"family": "Trn1", "accelerator": "Trainium", "count": 16},
-    "trn2.3xlarge": {"family": "Trn2", "accelerator": "Trainium2", "count": 1},
-    "trn2.48xlarge": {"family": "Trn2", "accelerator": "Trainium2", "count": 16},
+    "trn1.32xlarge": ("Trn1", "Trainium", 16),
+    "trn2.3xlarge": ("Trn2", "Trainium2", 1),
+    "trn2.48xlarge": ("Trn2", "Trainium2", 16),
 }
 
-
-def extract_json_data(html: str) -> list[dict]:
+# (prefix, family, accelerator, ((size marker, count), ...), default count) used to
+# infer info for instance types missing from INSTANCE_TYPE_INFO. Longer prefixes
+# come first so e.g. "p5en" is tried before "p5e" and "p5".
+_INSTANCE_PREFIXES: tuple[tuple[str, str, str, tuple[tuple[str, int], ...], int], ...] = (
+    ("p6-b300", "P6-B300", "B300", (), 8),
+    ("p6-b200", "P6-B200", "B200", (), 8),
+    ("u-p6e", "P6e", "GB200", (("x72", 72), ("x36", 36)), 0),
+    ("p5en", "P5en", "H200", (), 8),
+    ("p4de", "P4de", "A100", (), 8),
+    ("trn2", "Trn2", "Trainium2", (("48xlarge", 16),), 1),
+    ("trn1", "Trn1", "Trainium", (), 16),
+    ("p5e", "P5e", "H200", (), 8),
+    ("p4d", "P4d", "A100", (), 8),
+    ("p5", "P5", "H100", (("48xlarge", 8),), 1),
+)
+
+
+def extract_json_data(html: str | bytes) -> list[dict]:
     """Extract JSON data from the pricing page HTML.
 
     The page embeds pricing data in <script type="application/json"> tags,
@@ -90,41 +123,66 @@ def extract_json_data(html: str) -> list[dict]:
     New format (2026-04 onwards): fields holds the table directly as
     itemHeading, itemTableRowGroups, and itemTableData (the latter two are
     JSON strings).
+
+    The page is scanned as raw bytes; only pricing script bodies are decoded.
     """
-    pattern = r'<script type="application/json">(.*?)</script>'
-    script_matches = re.findall(pattern, html, re.DOTALL)
+    if isinstance(html, str):
+        html = html.encode("utf-8")
 
     all_rows = []
 
-    for script_content in script_matches:
-        try:
-            outer_data = json.loads(script_content)
-        except json.JSONDecodeError:
+    pos = 0
+    while (start := html.find(_SCRIPT_OPEN, pos)) >= 0:
+        start += len(_SCRIPT_OPEN)
+        end = html.find(_SCRIPT_CLOSE, start)
+        if end < 0:
+            break
+        pos = end + len(_SCRIPT_CLOSE)
+
+        # Every pricing table has "Pricing" in its heading; skip the rest
+        # without copying the script body out of the page.
+        if html.find(b"Pricing", start, end) < 0:
             continue
 
-        items = outer_data.get("data", {}).get("items", [])
-        for item in items:
-            fields = item.get("fields", {})
-            if "jsonData" in fields:
-                all_rows.extend(_extract_rows_old_format(fields))
-            elif "itemTableData" in fields:
-                all_rows.extend(_extract_rows_new_format(fields))
+        all_rows.extend(_extract_rows_from_script(html[start:end]))
 
     return all_rows
 
 
+def _extract_rows_from_script(script_content: bytes) -> list[dict]:
+    """Extract pricing rows from a single <script type="application/json"> body."""
+    try:
+        outer_data = orjson.loads(script_content)
+    except orjson.JSONDecodeError:
+        return []
+
+    rows = []
+    for item in outer_data.get("data", {}).get("items", []):
+        fields = item.get("fields", {})
+        if "jsonData" in fields:
+            rows.extend(_extract_rows_old_format(fields))
+        elif "itemTableData" in fields:
+            rows.extend(_extract_rows_new_format(fields))
+
+    return rows
+
+
 def _collect_table_rows(
     heading: str, row_definitions: list[dict], table_items: list[dict]
 ) -> list[dict]:
     """Build row dicts from table row definitions and data items."""
     rows = []
+    if not table_items:
+        return rows
+
     row_labels = {row["id"]: row.get("label", "") for row in row_definitions}
 
     for table_item in table_items:
         row_id = table_item.get("idProperty", "")
         instance_type = row_labels.get(row_id, "")
 
-        region = table_item.get("2", "")
+        # clean_html is memoised, so each distinct region cell is cleaned once.
+        region = clean_html(table_item.get("2", ""))
         price = table_item.get("3", "")
 
         if instance_type and region and price:
@@ -142,9 +200,13 @@ def _collect_table_rows(
 
 def _extract_rows_old_format(fields: dict) -> list[dict]:
     """Extract rows from the old fields.jsonData format."""
+    json_data_str = fields.get("jsonData", "")
+    if "Pricing" not in json_data_str:
+        return []
+
     try:
-        table_data = json.loads(fields.get("jsonData", ""))
-    except json.JSONDecodeError:
+        table_data = orjson.loads(json_data_str)
+    except orjson.JSONDecodeError:
         return []
 
     heading = table_data.get("heading", "")
@@ -164,53 +226,52 @@ def _extract_rows_new_format(fields: dict) -> list[dict]:
         return []
 
     try:
-        row_definitions = json.loads(fields.get("itemTableRowGroups", "[]"))
-        table_items = json.loads(fields.get("itemTableData", "[]"))
-    except json.JSONDecodeError:
+        table_items = orjson.loads(fields.get("itemTableData", "[]"))
+        if not table_items:
+            return []
+        row_definitions = orjson.loads(fields.get("itemTableRowGroups", "[]"))
+    except orjson.JSONDecodeError:
         return []
 
     return _collect_table_rows(heading, row_definitions, table_items)
 
 
+@functools.lru_cache(maxsize=512)
 def clean_html(text: str) -> str:
     """Remove HTML tags and unescape HTML entities."""
     if not text:
         return ""
     text = unescape(text)
-    soup = BeautifulSoup(text, "html.parser")
-    return soup.get_text().strip()
+    return _TAG_RE.sub("", text).strip()
 
 
 def parse_price_string(price_str: str) -> tuple[float, float]:
     """Parse price string like '$31.464 USD ($3.933 USD)' into (hourly, per_accelerator)."""
-    price_str = clean_html(price_str)
-
-    pattern = r"\$?([\d,]+\.?\d*)\s*(?:USD\s*)?\(\$?([\d,]+\.?\d*)\s*USD\)"
-    match = re.search(pattern, price_str)
-    if match:
-        hourly = float(match.group(1).replace(",", ""))
-        per_acc = float(match.group(2).replace(",", ""))
-        return hourly, per_acc
-
-    single_pattern = r"\$?([\d,]+\.?\d*)\s*USD"
-    match = re.search(single_pattern, price_str)
+    match = _PRICE_RE.search(unescape(price_str))
     if match:
-        hourly = float(match.group(1).replace(",", ""))
-        return hourly, 0.0
+        # Rates rarely reach four digits, so skip the replace copy when there is no comma.
+        hourly, per_acc = match.groups()
+        if "," in hourly:
+            hourly = hourly.replace(",", "")
+        if per_acc is None:
+            return float(hourly), 0.0
+        if "," in per_acc:
+            per_acc = per_acc.replace(",", "")
+        return float(hourly), float(per_acc)
 
     return 0.0, 0.0
 
 
 def parse_pricing_data(json_data: list[dict]) -> dict[str, InstanceTypePricing]:
     """Parse extracted JSON data into structured pricing information."""
-    instance_pricing: dict[str, list[PricingEntry]] = {}
+    entries_by_type: defaultdict[str, list[PricingEntry]] = defaultdict(list)
 
     for row in json_data:
         instance_type = row.get("instance_type", "")
         if not instance_type:
             continue
 
-        region = clean_html(row.get("region", ""))
+        region = row.get("region", "")
         if not region:
             continue
 
@@ -222,10 +283,7 @@ def parse_pricing_data(json_data: list[dict]) -> dict[str, InstanceTypePricing]:
         if hourly == 0.0:
             continue
 
-        region_code = REGION_NAME_TO_CODE.get(region, "")
-        if not region_code:
-            region_normalized = region.strip()
-            region_code = REGION_NAME_TO_CODE.get(region_normalized, "unknown")
+        region_code = _REGION_CODE_BY_KEY.get(region.casefold().strip(), "unknown")
 
         entry = PricingEntry(
             region=region,
@@ -233,20 +291,12 @@ def parse_pricing_data(json_data: list[dict]) -> dict[str, InstanceTypePricing]:
             hourly_rate_usd=hourly,
             accelerator_hourly_rate_usd=per_acc,
         )
-
-        if instance_type not in instance_pricing:
-            instance_pricing[instance_type] = []
-        instance_pricing[instance_type].append(entry)
+        entries_by_type[instance_type].append(entry)
 
     result: dict[str, InstanceTypePricing] = {}
-    for instance_type, entries in instance_pricing.items():
-        info = INSTANCE_TYPE_INFO.get(instance_type, {})
-        family = info.get("family", "Unknown")
-        accelerator = info.get("accelerator", "Unknown")
-        count = info.get("count", 0)
-
-        if family == "Unknown":
-            family, accelerator, count = _infer_instance_info(instance_type)
+    for instance_type, entries in entries_by_type.items():
+        info = INSTANCE_TYPE_INFO.get(instance_type) or _infer_instance_info(instance_type)
+        family, accelerator, count = info
 
         result[instance_type] = InstanceTypePricing(
             instance_family=family,
@@ -258,32 +308,13 @@ def parse_pricing_data(json_data: list[dict]) -> dict[str, InstanceTypePricing]:
     return result
 
 
+@functools.cache
 def _infer_instance_info(instance_type: str) -> tuple[str, str, int]:
     """Infer instance family, accelerator type, and count from instance type name."""
-    if instance_type.startswith("p5en"):
-        return "P5en", "H200", 8
-    elif instance_type.startswith("p5e"):
-        return "P5e", "H200", 8
-    elif instance_type.startswith("p5"):
-        count = 8 if "48xlarge" in instance_type else 1
-        return "P5", "H100", count
-    elif instance_type.startswith("p6-b300"):
-        return "P6-B300", "B300", 8
-    elif instance_type.startswith("p6-b200"):
-        return "P6-B200", "B200", 8
-    elif instance_type.startswith("u-p6e"):
-        if "x72" in instance_type:
-            return "P6e", "GB200", 72
-        elif "x36" in instance_type:
-            return "P6e", "GB200", 36
-        return "P6e", "GB200", 0
-    elif instance_type.startswith("p4de"):
-        return "P4de", "A100", 8
-    elif instance_type.startswith("p4d"):
-        return "P4d", "A100", 8
-    elif instance_type.startswith("trn2"):
-        count = 16 if "48xlarge" in instance_type else 1
-        return "Trn2", "Trainium2", count
-    elif instance_type.startswith("trn1"):
-        return "Trn1", "Trainium", 16
+    for prefix, family, accelerator, size_counts, default_count in _INSTANCE_PREFIXES:
+        if instance_type.startswith(prefix):
+            for marker, count in size_counts:
+                if marker in instance_type:
+                    return family, accelerator, count
+            return family, accelerator, default_count
     return "Unknown", "Unknown", 0
@@ -1,9 +1,12 @@
 """Main scraper for EC2 Capacity Blocks pricing."""
 
-import json
+import argparse
+import gzip
+import hashlib
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
 import requests
 
 from .models import PricingData, PricingMetadata
@@ -12,10 +15,19 @@ from .parser import extract_json_data, parse_pricing_data
 SOURCE_URL = "https://aws.amazon.com/ec2/capacityblocks/pricing/"
 VERSION = "1.0.0"
 DEFAULT_OUTPUT_PATH = Path(__file__).parent.parent / "data" / "pricing.json"
+DEFAULT_ETAG_PATH = DEFAULT_OUTPUT_PATH.with_name("etag.txt")
 
 
-def fetch_page(url: str) -> str:
-    """Fetch HTML content from the given URL."""
+class PageNotModified(Exception):
+    """Raised when the page is unchanged since the ETag sent with the request."""
+
+
+def fetch_page(url: str, etag: str | None = None) -> tuple[bytes, str | None]:
+    """Fetch raw HTML content and its ETag from the given URL.
+
+    When etag is given the request is conditional, and PageNotModified is
+    raised if the server answers 304.
+    """
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -24,14 +36,22 @@ def fetch_page(url: str) -> str:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
     }
+    if etag:
+        headers["If-None-Match"] = etag
+
     response = requests.get(url, headers=headers, timeout=30)
+    if response.status_code == 304:
+        raise PageNotModified(url)
     response.raise_for_status()
-    return response.text
+    return response.content, response.headers.get("ETag")
+
 
+def scrape_pricing(etag: str | None = None) -> tuple[PricingData, str | None]:
+    """Scrape pricing data from the AWS pricing page.
 
-def scrape_pricing() -> PricingData:
-    """Scrape pricing data from the AWS pricing page."""
-    html = fetch_page(SOURCE_URL)
+    Returns the pricing data together with the page's ETag, if any.
+    """
+    html, new_etag = fetch_page(SOURCE_URL, etag)
     json_data = extract_json_data(html)
 
     if not json_data:
@@ -42,35 +62,107 @@ def scrape_pricing() -> PricingData:
     if not instance_types:
         raise ValueError("Failed to parse any instance type pricing")
 
+    now = datetime.now(timezone.utc).replace(microsecond=0)
     metadata = PricingMetadata(
-        last_updated=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        last_updated=now.isoformat().replace("+00:00", "Z"),
         source_url=SOURCE_URL,
         version=VERSION,
     )
 
-    return PricingData(metadata=metadata, instance_types=instance_types)
+    return PricingData(metadata=metadata, instance_types=instance_types), new_etag
+
 
+def save_pricing(
+    data: PricingData,
+    output_path: Path | None = None,
+    pretty: bool = False,
+    compress: bool = False,
+) -> Path:
+    """Save pricing data to JSON file.
 
-def save_pricing(data: PricingData, output_path: Path | None = None) -> Path:
-    """Save pricing data to JSON file."""
+    The JSON is written compactly unless pretty is set. With compress, a
+    gzipped copy is also written next to it (e.g. pricing.json.gz).
+    """
     if output_path is None:
         output_path = DEFAULT_OUTPUT_PATH
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data.model_dump(), f, indent=2, ensure_ascii=False)
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    output_path.write_bytes(payload)
+
+    if compress:
+        gzip_path = output_path.with_name(output_path.name + ".gz")
+        gzip_path.write_bytes(gzip.compress(payload, mtime=0))
 
     return output_path
 
 
-def main() -> None:
+def scraper_fingerprint(pretty: bool = False, compress: bool = False) -> str:
+    """Identify the scraper code and output options that produce pricing.json.
+
+    A recorded ETag is only reused while this matches, so parser or mapping
+    changes and different output options always trigger a fresh scrape.
+    """
+    digest = hashlib.sha256(f"{VERSION}:{pretty}:{compress}".encode())
+    for source_path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source_path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def load_etag(fingerprint: str, etag_path: Path | None = None) -> str | None:
+    """Load the ETag recorded by the last successful scrape with the same fingerprint."""
+    if etag_path is None:
+        etag_path = DEFAULT_ETAG_PATH
+
+    try:
+        lines = etag_path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return None
+
+    if len(lines) != 2 or lines[0] != fingerprint:
+        return None
+    return lines[1].strip() or None
+
+
+def save_etag(etag: str | None, fingerprint: str, etag_path: Path | None = None) -> None:
+    """Record the ETag of the scraped page, or forget it if the page sent none."""
+    if etag_path is None:
+        etag_path = DEFAULT_ETAG_PATH
+
+    if etag:
+        etag_path.write_text(f"{fingerprint}\n{etag}\n", encoding="utf-8")
+    else:
+        etag_path.unlink(missing_ok=True)
+
+
+def main(argv: list[str] | None = None) -> None:
     """Main entry point for the scraper."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--pretty", action="store_true", help="indent the JSON output for readability"
+    )
+    arg_parser.add_argument(
+        "--gzip", action="store_true", help="also write a gzipped copy of the JSON output"
+    )
+    arg_parser.add_argument(
+        "--force", action="store_true", help="re-scrape even if the page is unchanged"
+    )
+    args = arg_parser.parse_args(argv)
+
     print("Fetching EC2 Capacity Blocks pricing data...")
 
+    fingerprint = scraper_fingerprint(pretty=args.pretty, compress=args.gzip)
+
+    # Only revalidate when there is existing output to fall back on.
+    etag = None
+    if not args.force and DEFAULT_OUTPUT_PATH.exists():
+        etag = load_etag(fingerprint)
+
     try:
-        data = scrape_pricing()
-        output_path = save_pricing(data)
+        data, new_etag = scrape_pricing(etag)
+        output_path = save_pricing(data, pretty=args.pretty, compress=args.gzip)
+        save_etag(new_etag, fingerprint)
 
         instance_count = len(data.instance_types)
         total_entries = sum(len(it.pricing) for it in data.instance_types.values())
@@ -85,6 +177,8 @@ def main() -> None:
             regions = len(pricing.pricing)
             print(f"  - {instance_type} ({pricing.instance_family}): {regions} region(s)")
 
+    except PageNotModified:
+        print(f"Pricing page unchanged since last scrape; keeping {DEFAULT_OUTPUT_PATH}")
     except requests.RequestException as e:
         print(f"Error fetching page: {e}")
         raise SystemExit(1)
@@ -56,10 +56,22 @@ def test_extract_new_format_rows():
     rows = extract_json_data(html)
     assert len(rows) == 2
     assert rows[0]["instance_type"] == "u-p6e-gb200x72"
-    assert "Dallas" in rows[0]["region"]
+    assert rows[0]["region"] == "US East (Dallas) Local Zone"
     assert "$761.904" in rows[0]["price"]
 
 
+def test_extract_accepts_raw_page_bytes():
+    table_data = NEW_FORMAT_FIELDS["itemTableData"].replace(
+        "US East (Dallas) Local Zone", "South America (São Paulo)"
+    )
+    payload = {"data": {"items": [{"fields": {**NEW_FORMAT_FIELDS, "itemTableData": table_data}}]}}
+    body = json.dumps(payload, ensure_ascii=False)
+    html = f'<script type="application/json">{body}</script>'.encode()
+    rows = extract_json_data(html)
+    assert len(rows) == 2
+    assert "São Paulo" in rows[0]["region"]
+
+
 def test_extract_new_format_skips_non_pricing_tables():
     fields = dict(NEW_FORMAT_FIELDS)
     fields["itemHeading"] = "OS pricing across Instance Types"
@@ -111,6 +123,20 @@ def test_parse_price_single_value():
     assert parse_price_string("$11.8 USD") == (11.8, 0.0)
 
 
+def test_parse_price_ignores_surrounding_markup():
+    assert parse_price_string("<p>$761.904 ($10.582 USD)<br /></p>\r\n") == (761.904, 10.582)
+    assert parse_price_string("<p><span>$1,234.5&nbsp;USD</span></p>") == (1234.5, 0.0)
+    assert parse_price_string("<p>$31.464 USD<br />($3.933 USD)</p>") == (31.464, 3.933)
+    assert parse_price_string(
+        "<p><strong>$31.464</strong> USD (<strong>$3.933</strong> USD)</p>"
+    ) == (31.464, 3.933)
+    assert parse_price_string("<span>$31.464</span> USD") == (31.464, 0.0)
+
+
+def test_parse_price_after_leading_text():
+    assert parse_price_string("<p>From $47.76 USD ($5.97 USD)</p>") == (47.76, 5.97)
+
+
 # --- Region code mapping for regions introduced with the new page ---
 
 def _rows_for_region(region: str) -> list[dict]:
@@ -135,3 +161,13 @@ def test_new_region_names_are_mapped():
     for region, code in expected.items():
         result = parse_pricing_data(_rows_for_region(region))
         assert result["p5e.48xlarge"].pricing[0].region_code == code, region
+
+
+def test_region_lookup_ignores_case_and_surrounding_whitespace():
+    result = parse_pricing_data(_rows_for_region("  us east (n. virginia)\n"))
+    assert result["p5e.48xlarge"].pricing[0].region_code == "us-east-1"
+
+
+def test_unmapped_region_is_unknown():
+    result = parse_pricing_data(_rows_for_region("Mars (Olympus Mons)"))
+    assert result["p5e.48xlarge"].pricing[0].region_code == "unknown"
@@ -0,0 +1,171 @@
+"""Tests for the scraper's fetching, caching and output behaviour."""
+
+import gzip
+import json
+from dataclasses import asdict
+
+import pytest
+import requests
+
+from src import scraper
+from src.models import InstanceTypePricing, PricingData, PricingEntry, PricingMetadata
+from src.scraper import (
+    PageNotModified,
+    fetch_page,
+    load_etag,
+    save_etag,
+    save_pricing,
+    scraper_fingerprint,
+)
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, content: bytes = b"", etag: str | None = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+def _stub_get(monkeypatch, response: _FakeResponse) -> list[dict]:
+    """Replace requests.get with a stub returning response; returns sent headers."""
+    sent_headers = []
+
+    def fake_get(url, headers=None, timeout=None):
+        sent_headers.append(dict(headers or {}))
+        return response
+
+    monkeypatch.setattr(scraper.requests, "get", fake_get)
+    return sent_headers
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the scraper's output and ETag paths at a temporary directory."""
+    monkeypatch.setattr(scraper, "DEFAULT_OUTPUT_PATH", tmp_path / "pricing.json")
+    monkeypatch.setattr(scraper, "DEFAULT_ETAG_PATH", tmp_path / "etag.txt")
+    return tmp_path
+
+
+# --- Conditional fetch ---
+
+def test_fetch_page_raises_on_not_modified(monkeypatch):
+    sent_headers = _stub_get(monkeypatch, _FakeResponse(304))
+    with pytest.raises(PageNotModified):
+        fetch_page("https://example.com/", etag='"abc"')
+    assert sent_headers[0]["If-None-Match"] == '"abc"'
+
+
+def test_fetch_page_returns_content_and_etag(monkeypatch):
+    sent_headers = _stub_get(monkeypatch, _FakeResponse(200, b"<html></html>", '"new"'))
+    assert fetch_page("https://example.com/") == (b"<html></html>", '"new"')
+    assert "If-None-Match" not in sent_headers[0]
+
+
+# --- main() with a recorded ETag ---
+
+def test_main_keeps_existing_file_when_page_unchanged(data_dir, monkeypatch):
+    output_path = data_dir / "pricing.json"
+    output_path.write_text('{"existing": true}', encoding="utf-8")
+    save_etag('"abc"', scraper_fingerprint())
+    sent_headers = _stub_get(monkeypatch, _FakeResponse(304))
+
+    scraper.main([])
+
+    assert sent_headers[0]["If-None-Match"] == '"abc"'
+    assert output_path.read_text(encoding="utf-8") == '{"existing": true}'
+
+
+def test_main_ignores_etag_from_different_fingerprint(data_dir, monkeypatch):
+    (data_dir / "pricing.json").write_text("{}", encoding="utf-8")
+    save_etag('"abc"', "stale-fingerprint")
+    sent_headers = _stub_get(monkeypatch, _FakeResponse(304))
+
+    scraper.main([])
+
+    assert "If-None-Match" not in sent_headers[0]
+
+
+def test_main_force_skips_revalidation(data_dir, monkeypatch):
+    (data_dir / "pricing.json").write_text("{}", encoding="utf-8")
+    save_etag('"abc"', scraper_fingerprint())
+    sent_headers = _stub_get(monkeypatch, _FakeResponse(304))
+
+    scraper.main(["--force"])
+
+    assert "If-None-Match" not in sent_headers[0]
+
+
+def test_fingerprint_depends_on_output_options():
+    assert scraper_fingerprint() == scraper_fingerprint()
+    assert scraper_fingerprint() != scraper_fingerprint(pretty=True)
+    assert scraper_fingerprint() != scraper_fingerprint(compress=True)
+
+
+# --- ETag persistence ---
+
+def test_etag_round_trip(tmp_path):
+    etag_path = tmp_path / "etag.txt"
+    save_etag('W/"abc"', "fp", etag_path)
+    assert load_etag("fp", etag_path) == 'W/"abc"'
+    assert load_etag("other", etag_path) is None
+
+
+def test_save_etag_none_removes_file(tmp_path):
+    etag_path = tmp_path / "etag.txt"
+    save_etag('"abc"', "fp", etag_path)
+    save_etag(None, "fp", etag_path)
+    assert not etag_path.exists()
+    assert load_etag("fp", etag_path) is None
+
+
+# --- Output modes ---
+
+def _sample_data() -> PricingData:
+    return PricingData(
+        metadata=PricingMetadata(
+            last_updated="2026-07-22T07:14:56Z",
+            source_url=scraper.SOURCE_URL,
+            version=scraper.VERSION,
+        ),
+        instance_types={
+            "p5.48xlarge": InstanceTypePricing(
+                instance_family="P5",
+                accelerator_type="H100",
+                accelerator_count=8,
+                pricing=[
+                    PricingEntry(
+                        region="South America (São Paulo)",
+                        region_code="sa-east-1",
+                        hourly_rate_usd=117.0,
+                        accelerator_hourly_rate_usd=14.625,
+                    )
+                ],
+            )
+        },
+    )
+
+
+def test_save_pricing_writes_compact_json_by_default(tmp_path):
+    data = _sample_data()
+    output_path = save_pricing(data, tmp_path / "pricing.json")
+    payload = output_path.read_bytes()
+    assert b"\n" not in payload
+    assert json.loads(payload) == asdict(data)
+    assert not (tmp_path / "pricing.json.gz").exists()
+
+
+def test_save_pricing_pretty_matches_indented_layout(tmp_path):
+    data = _sample_data()
+    output_path = save_pricing(data, tmp_path / "pricing.json", pretty=True)
+    expected = json.dumps(asdict(data), indent=2, ensure_ascii=False)
+    assert output_path.read_text(encoding="utf-8") == expected
+
+
+def test_save_pricing_compress_writes_gzip_copy(tmp_path):
+    output_path = save_pricing(_sample_data(), tmp_path / "pricing.json", compress=True)
+    gzip_path = tmp_path / "pricing.json.gz"
+    assert gzip.decompress(gzip_path.read_bytes()) == output_path.read_bytes()